@@ -1,7 +1,12 @@
+import re
 import sys
 import os
+import glob
+import multiprocessing
+from array import array
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Tuple
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 
 # Token Type mapping for the TINY-like language
 TOKEN_MAP = {
@@ -27,124 +32,176 @@ TOKEN_MAP = {
     "NUMBER": "NUMBER"
 }
 
+# Token types are stored as small integer ids (the position in TOKEN_MAP),
+# and only turned back to their names when the tokens are written out
+TOKEN_IDS = {lexeme: token_id for token_id, lexeme in enumerate(TOKEN_MAP)}
+TOKEN_NAMES = list(TOKEN_MAP.values())
+
 # for reserved words and symbols
 KEYWORDS = {"if", "then", "end", "repeat", "until", "read", "write", "else"}
 SPECIAL_SYMBOLS = {";", "+", "-", "*", "/", "(", ")", "<", "=", ":="}
 
+# reserved word -> token type id, so classifying an identifier takes a single lookup
+KEYWORD_TYPES = {keyword: TOKEN_IDS[keyword] for keyword in KEYWORDS}
+
+# single tokenizer pattern, compiled once and run over every chunk of the program in one pass;
+# every match first fast-forwards (possessively) over whitespace and comments
+# (a comment may span several lines, or run to the end of the file if never closed),
+# then captures the next token: assignment, number, identifier/keyword,
+# single-character symbol, or any other character (lexical error);
+# the token group is empty only at the end, once nothing but whitespace and comments is left,
+# so findall() returns the token values of a chunk followed by one or two ''
+# (identifiers contain ONLY letters, based on original intent, though TINY allows digits)
+TOKEN_RE = re.compile(r"(?:\s+|\{[^}]*\}?)*+(:=|\d+|[a-z]+|[;+\-*/()<=]|.)?", re.DOTALL | re.ASCII)
+
+# character categories, used to classify a lexeme by its first character with a single table lookup
+DIGIT, ALPHA, COLON, SYMBOL, ERROR = range(5)
+
+DISPATCH = bytearray([ERROR]) * 256
+DISPATCH[ord("0"):ord("9") + 1] = bytes([DIGIT]) * 10
+DISPATCH[ord("a"):ord("z") + 1] = bytes([ALPHA]) * 26
+DISPATCH[ord(":")] = COLON
+for c in ";+-*/()<=":
+    DISPATCH[ord(c)] = SYMBOL
+
+# the source file is read (and scanned) in chunks of about this many characters,
+# each chunk is completed up to the end of its last line
+READ_CHUNK_SIZE = 1 << 20
+
 
 ##############################################FUNCTIONS####################################################################################
 
 
-def get_token(line: str, in_comment: bool) -> Tuple[List[str], List[str], bool]:
+def get_lexeme_type(lexeme: str) -> Optional[int]:
     """
-    Parses a line of source code into a list of Tokens, respecting the comment state.
+    Classifies a lexeme matched by TOKEN_RE.
 
     Args:
-        line (str): The raw input string line.
-        in_comment (bool): True if currently inside a multi-line comment.
+        lexeme (str): The (lowercase) token value.
 
     Returns:
-        Tuples[list[str], list[str], bool]: list of parsed tokens types and values,
-                                            and the updated comment state.
+        Optional[int]: The token type id, or None if the lexeme is an unrecognized character.
+    """
+    code = ord(lexeme[0])
+    category = DISPATCH[code] if code < 256 else ERROR
+
+    # 1. Handle Numbers
+    if category == DIGIT:
+        return TOKEN_IDS["NUMBER"]
+
+    # 2. Handle Identifiers and Keywords
+    if category == ALPHA:
+        return KEYWORD_TYPES.get(lexeme, TOKEN_IDS["IDENTIFIER"])
+
+    # 3. Handle Symbols (:= and the single-character ones, a lone ':' is an error)
+    if category == SYMBOL or (category == COLON and lexeme == ":="):
+        return TOKEN_IDS[lexeme]
+
+    return None
+
+
+def report_lexical_errors(text: str, pos: int, error_lexemes: Set[str]):
+    """
+    Prints every unrecognized character of a chunk (in order), with the line it appears on.
+
+    Args:
+        text (str): The (lowercase) chunk.
+        pos (int): Where scanning the chunk started.
+        error_lexemes (set[str]): The lexemes that are unrecognized characters.
     """
+    for match in TOKEN_RE.finditer(text, pos):
+        value = match.group(1)
+        if value in error_lexemes:
+            start = match.start(1)
+            line_end = text.find("\n", start)
+            line = text[text.rfind("\n", 0, start) + 1:line_end if line_end != -1 else len(text)].strip()
+            print(f"Lexical Error: Unrecognized character '{value}' on line: {line}")
+
+
+def get_tokens(program_chunks: Iterable[str]) -> Tuple[List[str], array]:
+    """
+    Parses the source code into Tokens in a single pass over its chunks.
+
+    The tokens are kept as flat parallel sequences (one entry per token).
+    Their values are collected by the regex engine (TOKEN_RE.findall), and their types
+    are looked up per value, every distinct value being classified only once.
 
-    tokens_type_list: List[str] = []
-    tokens_value_list: List[str] = []
+    Args:
+        program_chunks (Iterable[str]): The raw program text, in chunks that end on a line break
+                                        (only a comment can continue into the next chunk).
 
-    # Ensure line is lowercase and remove leading/trailing whitespace
-    line = line.lower().strip()
-    length = len(line)
-    i = 0
+    Returns:
+        Tuples[list[str], array]: parsed tokens values and types (ids into TOKEN_NAMES).
+    """
 
-    while i < length:
-        char = line[i]
+    token_values: List[str] = []
+    token_types = array('B')
+    # type id of every distinct lexeme seen so far, and the lexemes that are lexical errors
+    lexeme_types: Dict[str, int] = {}
+    error_lexemes: Set[str] = set()
+    # State variable to track if the previous chunk ended inside a (multi-line) comment
+    in_comment = False
+
+    for chunk in program_chunks:
+        # Ensure the code is lowercase (done once for the whole chunk)
+        text = chunk.lower()
+        pos = 0
 
-        # 1. Handle Comments (High Priority)
         if in_comment:
-            # We are currently inside a comment, search for the closing brace '}'
-            end_comment_index = line.find("}", i)
-            if end_comment_index != -1:
-                # Comment block ends on this line
-                in_comment = False
-                i = end_comment_index + 1  # Start scanning after the closing brace
+            # search for the closing brace '}', or ignore the whole chunk if the comment continues
+            pos = text.find("}") + 1
+            if pos == 0:
                 continue
+
+        # a '{' always opens a comment outside of one, and the first '}' closes it,
+        # so the chunk ends inside a comment exactly when its last '{' comes after its last '}'
+        in_comment = text.rfind("{") > text.rfind("}")
+
+        values = TOKEN_RE.findall(text, pos)
+        # drop the final '' of the trailing whitespace and comments
+        while values and not values[-1]:
+            values.pop()
+
+        # classify the lexemes not seen before
+        chunk_lexemes = set(values)
+        for lexeme in chunk_lexemes.difference(lexeme_types):
+            lexeme_type = get_lexeme_type(lexeme)
+            if lexeme_type is None:
+                error_lexemes.add(lexeme)
             else:
-                # Comment continues to the next line (ignore the rest of this line)
-                return tokens_value_list, tokens_type_list, True
-
-        # 1b. Skip Whitespace only if not in a comment
-        if char.isspace():
-            i += 1
-            continue
-
-        # 1c. Handle start of a new comment (if not already in one, which is handled above)
-        if char == "{":
-            in_comment = True
-            # Check if the comment ends on the same line
-            end_comment_index = line.find("}", i)
-            if end_comment_index != -1:
-                # Single-line comment block
-                in_comment = False
-                i = end_comment_index + 1
-            else:
-                # Multi-line comment starts on this line, continues to the next
-                # The rest of this line is ignored, and the state is returned as True
-                return tokens_value_list, tokens_type_list, True
-            continue
-
-        # 3. Handle Numbers
-        if char.isdigit():
-            start = i
-            i += 1
-            # Continue advancing as long as the next character is a digit
-            while i < length and line[i].isdigit():
-                i += 1
-
-            value = line[start:i]
-            tokens_value_list.append(value)
-            tokens_type_list.append(TOKEN_MAP["NUMBER"])
-            continue
-
-        # 4. Handle Identifiers and Keywords
-        if char.isalpha():
-            start = i
-            i += 1
-            # Identifiers can contain ONLY letters (based on original intent, though TINY allows digits)
-            while i < length and (line[i].isalpha()):
-                i += 1
-
-            value = line[start:i]
-            tokens_value_list.append(value)
-
-            # Check if the parsed identifier is a reserved keyword
-            if value in KEYWORDS:
-                tokens_type_list.append(TOKEN_MAP[value])
-            else:
-                tokens_type_list.append(TOKEN_MAP["IDENTIFIER"])
-            continue
-
-        # 5. Handle Two-Character Symbols (:=)
-        if char == ":" and i + 1 < length and line[i + 1] == "=":
-            tokens_value_list.append(":=")
-            tokens_type_list.append(TOKEN_MAP[":="])
-            i += 2
-            continue
-
-        # 6. Handle Single-Character Symbols
-        if char in SPECIAL_SYMBOLS:
-            tokens_value_list.append(char)
-            tokens_type_list.append(TOKEN_MAP[char])
-            i += 1
-            continue
-            
-        # 7. Error Handling for unrecognized character (optional but good practice)
-        print(f"Lexical Error: Unrecognized character '{char}' on line: {line}")
-        i += 1
-        
-    return tokens_value_list, tokens_type_list, in_comment
+                lexeme_types[lexeme] = lexeme_type
+
+        # unrecognized characters are reported and left out of the tokens
+        if not error_lexemes.isdisjoint(chunk_lexemes):
+            report_lexical_errors(text, pos, error_lexemes)
+            values = [value for value in values if value not in error_lexemes]
+
+        token_values.extend(values)
+        token_types.extend(map(lexeme_types.__getitem__, values))
+
+    return token_values, token_types
+
+
+def scan_file(file_path: Path) -> Tuple[List[str], array]:
+    """
+    Parses a source file into Tokens (see get_tokens), letting any reading error propagate.
+
+    Args:
+        file_path (Path): The input file.
+
+    Returns:
+        Tuples[list[str], array]: list of parsed tokens values and types.
+    """
+    with file_path.open('r', encoding='utf-8', buffering=READ_CHUNK_SIZE) as program_file:
+        print(f"--- Scanning file: {file_path.name} ---")
+
+        # streaming the code chunk by chunk (each one completed to the end of its line),
+        # so the whole file is never held in memory at once
+        program_chunks = iter(lambda: program_file.read(READ_CHUNK_SIZE) + program_file.readline(), "")
+        return get_tokens(program_chunks)
 
 
-def scanningFile(file_path: Path) -> Tuple[List[List[str]], List[List[str]]]:
+def scanningFile(file_path: Path) -> Tuple[List[str], array]:
     """
     Parses source code into a tuple of Token objects with the source code itself.
 
@@ -152,31 +209,12 @@ def scanningFile(file_path: Path) -> Tuple[List[List[str]], List[List[str]]]:
         file_path (Path): The input file.
 
     Returns:
-        Tuples[list[str], list[str]]: list of parsed tokens types and values with the source code itself.
+        Tuples[list[str], array]: list of parsed tokens values and types (see get_tokens).
         
     """
-    code_token_values: List[List[str]] = []
-    code_token_types: List[List[str]] = []
-    program_content = ""
-    # NEW: State variable to track if we are currently inside a multi-line comment
-    in_comment = False 
-    
     try:
-        program_content = file_path.read_text(encoding='utf-8')
-        print(f"--- Scanning file: {file_path.name} ---")
+        return scan_file(file_path)
 
-        # spliting the code by lines
-        for line in program_content.strip().split('\n'):
-            # Pass the current comment state and receive the new state
-            line_token_values, line_token_types, in_comment = get_token(line, in_comment)
-            
-            # Only append tokens if some were found (i.e., line was not entirely a comment)
-            if line_token_types:
-                code_token_types.append(line_token_types)
-                code_token_values.append(line_token_values)
-
-        return code_token_values, code_token_types 
-        
     except FileNotFoundError:
         print(f"Error: Input file not found at '{file_path}'")
         try:
@@ -193,8 +231,87 @@ def scanningFile(file_path: Path) -> Tuple[List[List[str]], List[List[str]]]:
         sys.exit(1)
 
 
+def write_tokens_file(input_path: Path, token_values: List[str], token_types: array) -> Path:
+    """
+    Writes the tokens of a source file next to it, as "<name>_tokens.txt" with one "value,TYPE" per line.
+
+    Args:
+        input_path (Path): The scanned source file.
+        token_values (list[str]): The parsed tokens values.
+        token_types (array): The parsed tokens types ids.
+
+    Returns:
+        Path: The written output file.
+    """
+    output_path = input_path.with_name(f"{input_path.stem}_tokens.txt")
+
+    with open(output_path, 'w', encoding='utf-8') as outfile:
+        # main functionality: writing the tokens to the output file (built first, written at once)
+        names = TOKEN_NAMES
+        outfile.write("".join([f"{t_value},{names[t_type]}\n" for t_value, t_type in zip(token_values, token_types)]))
+
+    return output_path
+
+
+def batch_scan_file(file_path: Path) -> Optional[str]:
+    """
+    Scans one file of a batch and writes its tokens file, run inside a worker process.
+
+    Args:
+        file_path (Path): The input file.
+
+    Returns:
+        Optional[str]: An error message if the file could not be scanned or written, None otherwise.
+    """
+    try:
+        token_values, token_types = scan_file(file_path)
+        write_tokens_file(file_path, token_values, token_types)
+    except Exception as e:
+        return f"Error scanning '{file_path}': {e}"
+    return None
+
+
+def batch_main(targets: List[str]):
+    """
+    Scans many files in parallel, one worker process per CPU (at most 61 on Windows).
+
+    Args:
+        targets (list[str]): Files, directories (every .txt file in them) or glob patterns.
+    """
+    paths: List[Path] = []
+    for target in targets:
+        if os.path.isdir(target):
+            matches = glob.glob(os.path.join(glob.escape(target), "*.txt"))
+        elif glob.has_magic(target):
+            matches = glob.glob(target)
+        else:
+            matches = [target]
+        # skip the outputs of a previous run
+        paths.extend(Path(match) for match in sorted(matches) if not match.endswith("_tokens.txt"))
+
+    if not paths:
+        print("No files to scan.")
+        sys.exit(1)
+
+    # the scanner is CPU bound pure Python, so the files are spread over processes rather than threads
+    # (the default worker count is the CPU count, capped at the 61 workers Windows allows)
+    with ProcessPoolExecutor() as executor:
+        errors = [error for error in executor.map(batch_scan_file, paths, chunksize=8) if error]
+
+    for error in errors:
+        print(error)
+    print(f"\nScanned {len(paths) - len(errors)} of {len(paths)} files.")
+    if errors:
+        sys.exit(1)
+
+
 def main():
 
+    # batch mode: scanner.py --batch <files, directories or glob patterns>
+    if len(sys.argv) > 1 and sys.argv[1] == "--batch":
+        batch_main(sys.argv[2:])
+        return
+
     prompt = "Please enter the file path without any (\"\") for the scanning operation:"
         
     # NOTE: For testing purposes in a controlled environment, 
@@ -208,19 +325,14 @@ def main():
         
     input_path = Path(input_raw)
     
-    code_token_values, code_token_types = scanningFile(input_path)
-    
-    output_path = input_path.with_name(f"{input_path.stem}_tokens.txt")
+    token_values, token_types = scanningFile(input_path)
     
     # Write the results to the output file
     try:
-        with open(output_path, 'w', encoding='utf-8') as outfile:
-            # main functionality: writing the tokens to the output file
-            for token_types, token_values in zip(code_token_types, code_token_values):
-                for t_type, t_value in zip(token_types, token_values):
-                    outfile.write(f"{t_value},{t_type}\n")
+        write_tokens_file(input_path, token_values, token_types)
 
     except Exception as e:
+        output_path = input_path.with_name(f"{input_path.stem}_tokens.txt")
         print(f"Error writing output file to {output_path}: {e}")
         try:
             input("\nPress Enter to exit...")
@@ -235,4 +347,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # needed for the worker processes of the batch mode in the frozen scanner.exe
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file